@@ -1,11 +1,15 @@
 import sqlite3
 import datetime
+import functools
 from zoneinfo import ZoneInfo
 from typing import List, Dict, Optional, Tuple
 
 class Database:
     def __init__(self, db_file: str = "workbot.db"):
         self.db_file = db_file
+        # daily_stats 조회 결과 LRU 캐시 (기록이 바뀌면 비움)
+        self._fetch_user_stats = functools.lru_cache(maxsize=128)(self._fetch_user_stats_uncached)
+        self._fetch_weekly_net = functools.lru_cache(maxsize=128)(self._fetch_weekly_net_uncached)
         self.init_database()
 
     def init_database(self):
@@ -66,9 +70,76 @@ class Database:
                     PRIMARY KEY (meeting_id, member_id)
                 )
             ''')
+
+            # 일별 근무 집계 테이블 (퇴근/휴식 종료 시 증분 갱신)
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS daily_stats (
+                    user_id TEXT,
+                    day DATE,
+                    net_seconds INTEGER DEFAULT 0,
+                    break_seconds INTEGER DEFAULT 0,
+                    sessions INTEGER DEFAULT 0,
+                    breaks INTEGER DEFAULT 0,
+                    PRIMARY KEY (user_id, day)
+                )
+            ''')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_daily_stats_day
+                ON daily_stats (day)
+            ''')
             
             conn.commit()
 
+        self._backfill_daily_stats()
+
+    def _backfill_daily_stats(self):
+        """daily_stats가 비어 있으면 기존 근무/휴식 기록으로 한 번 채움"""
+        with sqlite3.connect(self.db_file) as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT 1 FROM daily_stats LIMIT 1")
+            if cursor.fetchone():
+                return
+
+            # 근무 기록별 휴식 시간 합계 (_calculate_work_hours_excluding_breaks와 같은 조건)
+            cursor.execute("""
+                SELECT w.user_id, w.date, w.start_time, w.end_time,
+                       COALESCE(SUM(julianday(b.end_time) - julianday(b.start_time)), 0) * 86400
+                FROM work_records w
+                LEFT JOIN break_records b
+                    ON b.work_record_id = w.id AND b.user_id = w.user_id
+                    AND b.end_time IS NOT NULL
+                    AND b.start_time >= w.start_time AND b.end_time <= w.end_time
+                WHERE w.end_time IS NOT NULL
+                GROUP BY w.id
+            """)
+            work_rows = cursor.fetchall()
+
+            cursor.execute("""
+                SELECT w.user_id, w.date, b.start_time, b.end_time
+                FROM break_records b
+                JOIN work_records w ON w.id = b.work_record_id
+                WHERE b.end_time IS NOT NULL
+            """)
+            break_rows = cursor.fetchall()
+
+            for user_id, day, start, end, break_seconds in work_rows:
+                work_seconds = (
+                    datetime.datetime.fromisoformat(end) -
+                    datetime.datetime.fromisoformat(start)
+                ).total_seconds()
+                self._add_daily_stats(
+                    cursor, user_id, day,
+                    net_seconds=round(max(0, work_seconds - break_seconds)), sessions=1
+                )
+            for user_id, day, start, end in break_rows:
+                break_seconds = (
+                    datetime.datetime.fromisoformat(end) -
+                    datetime.datetime.fromisoformat(start)
+                ).total_seconds()
+                self._add_daily_stats(
+                    cursor, user_id, day, break_seconds=round(break_seconds), breaks=1
+                )
+
     def get_active_work_record(self, user_id: str) -> Optional[Tuple]:
         """현재 진행 중인 work_record를 가져옴"""
         with sqlite3.connect(self.db_file) as conn:
@@ -125,9 +196,13 @@ class Database:
         if not active_work:
             return False
 
+        now = datetime.datetime.now(ZoneInfo("Asia/Seoul"))
+        work_hours = self._calculate_work_hours_excluding_breaks(
+            datetime.datetime.fromisoformat(active_work[1]), now, user_id, active_work[0]
+        )
+
         with sqlite3.connect(self.db_file) as conn:
             cursor = conn.cursor()
-            now = datetime.datetime.now(ZoneInfo("Asia/Seoul"))
             
             # 퇴근 처리
             cursor.execute("""
@@ -136,6 +211,13 @@ class Database:
                 WHERE id = ?
             """, (now, active_work[0]))
 
+            # 일별 집계 갱신 (출근한 날짜 기준)
+            cursor.execute("SELECT date FROM work_records WHERE id = ?", (active_work[0],))
+            self._add_daily_stats(
+                cursor, user_id, cursor.fetchone()[0],
+                net_seconds=round(work_hours * 3600), sessions=1
+            )
+
             # 주간 근무 시간 업데이트
             week_number = self._get_week_number(now.date())
             weekly_hours = self._calculate_weekly_hours(user_id, week_number)
@@ -144,8 +226,9 @@ class Database:
                 SET weekly_hours = ?
                 WHERE user_id = ? AND week_number = ?
             """, (weekly_hours, user_id, week_number))
-            
-            return True
+
+        self._clear_stats_cache()
+        return True
 
     def start_break(self, user_id: str) -> bool:
         if not self.is_clocked_in(user_id) or self.is_on_break(user_id):
@@ -176,7 +259,8 @@ class Database:
             return True
 
     def end_break(self, user_id: str) -> bool:
-        if not self.is_on_break(user_id):
+        active_break = self.get_active_break(user_id)
+        if not active_break:
             return False
             
         with sqlite3.connect(self.db_file) as conn:
@@ -201,8 +285,19 @@ class Database:
                 SET end_time = ?
                 WHERE user_id = ? AND end_time IS NULL
             """, (now, user_id))
-            
-            return True
+
+            # 일별 집계 갱신 (출근한 날짜 기준)
+            break_seconds = (
+                now - datetime.datetime.fromisoformat(active_break[2])
+            ).total_seconds()
+            cursor.execute("SELECT date FROM work_records WHERE id = ?", (active_break[1],))
+            self._add_daily_stats(
+                cursor, user_id, cursor.fetchone()[0],
+                break_seconds=round(break_seconds), breaks=1
+            )
+
+        self._clear_stats_cache()
+        return True
 
     def _calculate_work_hours_excluding_breaks(
         self, 
@@ -289,6 +384,115 @@ class Database:
                 "daily_hours": round(daily_hours, 2),
                 "weekly_hours": weekly_hours
             }
+
+    def _add_daily_stats(
+        self,
+        cursor: sqlite3.Cursor,
+        user_id: str,
+        day: str,
+        net_seconds: int = 0,
+        break_seconds: int = 0,
+        sessions: int = 0,
+        breaks: int = 0
+    ):
+        """daily_stats의 (user_id, day) 행에 값을 더함"""
+        cursor.execute("""
+            INSERT INTO daily_stats (user_id, day, net_seconds, break_seconds, sessions, breaks)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT (user_id, day) DO UPDATE SET
+                net_seconds = net_seconds + excluded.net_seconds,
+                break_seconds = break_seconds + excluded.break_seconds,
+                sessions = sessions + excluded.sessions,
+                breaks = breaks + excluded.breaks
+        """, (user_id, day, net_seconds, break_seconds, sessions, breaks))
+
+    def _clear_stats_cache(self):
+        self._fetch_user_stats.cache_clear()
+        self._fetch_weekly_net.cache_clear()
+
+    def _fetch_user_stats_uncached(
+        self, start: datetime.date, end: datetime.date
+    ) -> Tuple[Tuple, ...]:
+        """[start, end) 기간의 사용자별 합계 (user_id, net, break, sessions, breaks, days)
+
+        퇴근 완료된 근무가 있는 사용자만 포함하며, days는 퇴근 완료된 근무가 있는 날만 셈
+        """
+        with sqlite3.connect(self.db_file) as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT user_id, SUM(net_seconds), SUM(break_seconds),
+                       SUM(sessions), SUM(breaks), SUM(sessions > 0)
+                FROM daily_stats
+                WHERE day >= ? AND day < ?
+                GROUP BY user_id
+                HAVING SUM(sessions) > 0
+                ORDER BY SUM(net_seconds) DESC
+            """, (start, end))
+            return tuple(cursor.fetchall())
+
+    def _fetch_weekly_net_uncached(
+        self, start: datetime.date, end: datetime.date
+    ) -> Tuple[Tuple, ...]:
+        """주 시작일(월요일)이 [start, end)에 속하는 주의 사용자별 순근무 초 (user_id, week_start, net)
+
+        기간 경계에 걸친 주도 잘리지 않도록 월요일~일요일 전체를 합산하며,
+        각 주는 주 시작일이 속한 기간에서만 집계됨
+        """
+        week_from = start - datetime.timedelta(days=start.weekday())
+        last_day = end - datetime.timedelta(days=1)
+        week_to = last_day + datetime.timedelta(days=7 - last_day.weekday())
+        with sqlite3.connect(self.db_file) as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT user_id,
+                       date(day, '-' || ((CAST(strftime('%w', day) AS INTEGER) + 6) % 7) || ' days')
+                           AS week_start,
+                       SUM(net_seconds)
+                FROM daily_stats
+                WHERE day >= ? AND day < ?
+                GROUP BY user_id, week_start
+                HAVING week_start >= ? AND week_start < ?
+            """, (week_from, week_to, start, end))
+            return tuple(cursor.fetchall())
+
+    def get_period_stats(
+        self,
+        start: datetime.date,
+        end: datetime.date,
+        overtime_hours: float = 52
+    ) -> Dict[str, Dict]:
+        """[start, end) 기간의 사용자별 근무 통계
+
+        순근무/근무일/근무 횟수는 퇴근 완료된 기록 기준이고, 휴식 통계는
+        아직 퇴근하지 않은 근무 중에 끝난 휴식도 포함함
+        """
+        overtime_weeks: Dict[str, int] = {}
+        for user_id, _, net_seconds in self._fetch_weekly_net(start, end):
+            if net_seconds > overtime_hours * 3600:
+                overtime_weeks[user_id] = overtime_weeks.get(user_id, 0) + 1
+
+        stats = {}
+        for user_id, net_seconds, break_seconds, sessions, breaks, days in self._fetch_user_stats(start, end):
+            stats[user_id] = {
+                "net_hours": round(net_seconds / 3600, 2),
+                "break_hours": round(break_seconds / 3600, 2),
+                "sessions": sessions,
+                "breaks": breaks,
+                "days": days,
+                "avg_break_minutes": round(break_seconds / 60 / breaks, 1) if breaks else 0,
+                "overtime_weeks": overtime_weeks.get(user_id, 0)
+            }
+        return stats
+
+    def get_leaderboard(
+        self, start: datetime.date, end: datetime.date, limit: Optional[int] = None
+    ) -> List[Tuple[str, float]]:
+        """[start, end) 기간의 순근무 시간 순으로 정렬된 사용자 (user_id, 시간), limit가 없으면 전체"""
+        return [
+            (user_id, round(net_seconds / 3600, 2))
+            for user_id, net_seconds, _, _, _, _ in self._fetch_user_stats(start, end)[:limit]
+        ]
+
     def get_current_working_users(self) -> List[str]:
         with sqlite3.connect(self.db_file) as conn:
             cursor = conn.cursor()
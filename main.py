@@ -4,7 +4,7 @@ from discord import app_commands
 import datetime
 from database import Database
 from zoneinfo import ZoneInfo
-from typing import List, Dict
+from typing import List, Dict, Optional, Tuple
 import asyncio
 import os
 
@@ -111,6 +111,137 @@ async def view_results(interaction: discord.Interaction):
 
     await interaction.response.send_message("\n\n".join(results), ephemeral=True)
 
+def is_admin(member: discord.Member) -> bool:
+    if member.guild_permissions.administrator:
+        return True
+    admin_roles = bot.db.get_admin_roles()
+    return any(role.id in admin_roles for role in member.roles)
+
+def month_range(year: int, month: int) -> Tuple[datetime.date, datetime.date]:
+    start = datetime.date(year, month, 1)
+    end = datetime.date(year + month // 12, month % 12 + 1, 1)
+    return start, end
+
+def quarter_range(year: int, quarter: int) -> Tuple[datetime.date, datetime.date]:
+    start, _ = month_range(year, quarter * 3 - 2)
+    _, end = month_range(year, quarter * 3)
+    return start, end
+
+def split_messages(blocks: List[str], separator: str = "\n\n", limit: int = 2000) -> List[str]:
+    """디스코드 메시지 길이 제한에 맞게 블록들을 여러 메시지로 나눔"""
+    messages = []
+    current = ""
+    for block in blocks:
+        if current and len(current) + len(separator) + len(block) > limit:
+            messages.append(current)
+            current = block
+        else:
+            current = current + separator + block if current else block
+    if current:
+        messages.append(current)
+    return messages
+
+async def send_messages(interaction: discord.Interaction, messages: List[str]):
+    await interaction.response.send_message(messages[0], ephemeral=True)
+    for message in messages[1:]:
+        await interaction.followup.send(message, ephemeral=True)
+
+def format_period_stats(guild: discord.Guild, title: str, stats: Dict[str, Dict]) -> List[str]:
+    results = []
+    for user_id, stat in stats.items():
+        member = guild.get_member(int(user_id))
+        if member is None:
+            continue
+        results.append(
+            f"{member.display_name}:\n"
+            f"- 순근무: {stat['net_hours']:.2f}시간 ({stat['days']}일, {stat['sessions']}회)\n"
+            f"- 평균 휴식: {stat['avg_break_minutes']:.1f}분 ({stat['breaks']}회)\n"
+            f"- 52시간 초과 주 (이 기간에 시작한 주): {stat['overtime_weeks']}주"
+        )
+    if not results:
+        return [f"{title}\n표시할 근무 기록이 없습니다."]
+    return split_messages([title] + results)
+
+stats_group = app_commands.Group(name="통계", description="근무 통계 관련 명령어 모음 (관리자 전용)")
+
+@stats_group.command(name="월", description="월별 근무 통계를 확인합니다.")
+@app_commands.describe(year="연도 (기본값: 올해)", month="월 (기본값: 이번 달)")
+async def monthly_stats(
+    interaction: discord.Interaction,
+    year: Optional[app_commands.Range[int, 2000, 9998]] = None,
+    month: Optional[app_commands.Range[int, 1, 12]] = None
+):
+    if not is_admin(interaction.user):
+        await interaction.response.send_message("권한이 없습니다!", ephemeral=True)
+        return
+
+    now = datetime.datetime.now(ZoneInfo("Asia/Seoul"))
+    if year is None:
+        year = now.year
+    if month is None:
+        month = now.month
+    stats = bot.db.get_period_stats(*month_range(year, month))
+    await send_messages(
+        interaction,
+        format_period_stats(interaction.guild, f"{year}년 {month}월 근무 통계", stats)
+    )
+
+@stats_group.command(name="분기", description="분기별 근무 통계를 확인합니다.")
+@app_commands.describe(year="연도 (기본값: 올해)", quarter="분기 (기본값: 이번 분기)")
+async def quarterly_stats(
+    interaction: discord.Interaction,
+    year: Optional[app_commands.Range[int, 2000, 9998]] = None,
+    quarter: Optional[app_commands.Range[int, 1, 4]] = None
+):
+    if not is_admin(interaction.user):
+        await interaction.response.send_message("권한이 없습니다!", ephemeral=True)
+        return
+
+    now = datetime.datetime.now(ZoneInfo("Asia/Seoul"))
+    if year is None:
+        year = now.year
+    if quarter is None:
+        quarter = (now.month - 1) // 3 + 1
+    stats = bot.db.get_period_stats(*quarter_range(year, quarter))
+    await send_messages(
+        interaction,
+        format_period_stats(interaction.guild, f"{year}년 {quarter}분기 근무 통계", stats)
+    )
+
+@stats_group.command(name="순위", description="기간별 근무 시간 순위를 확인합니다.")
+@app_commands.describe(period="집계 기간")
+@app_commands.choices(period=[
+    app_commands.Choice(name="이번 달", value="month"),
+    app_commands.Choice(name="이번 분기", value="quarter"),
+])
+async def stats_leaderboard(interaction: discord.Interaction, period: str = "month"):
+    if not is_admin(interaction.user):
+        await interaction.response.send_message("권한이 없습니다!", ephemeral=True)
+        return
+
+    now = datetime.datetime.now(ZoneInfo("Asia/Seoul"))
+    if period == "quarter":
+        start, end = quarter_range(now.year, (now.month - 1) // 3 + 1)
+        title = f"{now.year}년 {(now.month - 1) // 3 + 1}분기 근무 시간 순위"
+    else:
+        start, end = month_range(now.year, now.month)
+        title = f"{now.year}년 {now.month}월 근무 시간 순위"
+
+    lines = []
+    for user_id, net_hours in bot.db.get_leaderboard(start, end):
+        member = interaction.guild.get_member(int(user_id))
+        if member is None:
+            continue
+        lines.append(f"{len(lines) + 1}. {member.display_name}: {net_hours:.2f}시간")
+        if len(lines) == 10:
+            break
+
+    if not lines:
+        await interaction.response.send_message(f"{title}\n표시할 근무 기록이 없습니다.", ephemeral=True)
+        return
+
+    await send_messages(interaction, split_messages([title] + lines, separator="\n"))
+
 async def members_autocomplete(
     interaction: discord.Interaction,
     current: str,
@@ -297,6 +428,7 @@ async def end_meeting(interaction: discord.Interaction, meeting_title: str = Non
     await interaction.followup.send(f"회의 '{meeting_title}'이(가) 종료되었습니다.", ephemeral=True)
 
 bot.tree.add_command(meeting_group)
+bot.tree.add_command(stats_group)
 
 token = os.environ["TOKEN"]
 bot.run(token)